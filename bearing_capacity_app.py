@@ -1,7 +1,7 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
+import plotly.graph_objects as go
+
+from bearing_core import compute_bearing, prandtl_geometry
 
 # --- KONFIGURASJON ---
 st.set_page_config(page_title="Geoteknikk: Bæreevne (EC7)", layout="wide")
@@ -25,22 +25,8 @@ D = st.sidebar.number_input("Dybde D [m]", value=1.0, min_value=0.0, step=0.1)
 e = st.sidebar.slider("Eksentrisitet e [m]", -B/3, B/3, 0.0, 0.01)
 
 # --- BEREGNINGER ---
-# 1. Dimensjonerende verdier
-phi_d_rad = np.arctan(np.tan(np.radians(phi_k)) / gamma_m)
-phi_d_deg = np.degrees(phi_d_rad)
-
-# 2. Effektiv bredde
-B_prime = B - 2 * abs(e)
-
-# 3. Bæreevnefaktorer (EC7-1 Annex D)
-Nq = np.exp(np.pi * np.tan(phi_d_rad)) * (np.tan(np.radians(45) + phi_d_rad/2))**2
-Ngamma = 2 * (Nq - 1) * np.tan(phi_d_rad)
-
-# 4. Kapasitet og grunntrykk
-q_sur = gamma * D
-sigma_d = (q_sur + attraksjon) * Nq + 0.5 * gamma * B_prime * Ngamma - attraksjon
-q_faktisk = V_k / B_prime
-utnyttelse = (q_faktisk / sigma_d) * 100
+phi_d_rad, phi_d_deg, B_prime, Nq, Ngamma, sigma_d, q_faktisk, utnyttelse = compute_bearing(
+    phi_k, attraksjon, gamma, gamma_m, V_k, B, D, e)
 
 # --- HOVEDPANEL: METRICS ---
 m1, m2, m3, m4 = st.columns(4)
@@ -50,84 +36,87 @@ m3.metric("Utnyttelse", f"{utnyttelse:.1f}%")
 m4.metric("B' (effektiv)", f"{B_prime:.2f} m")
 
 # --- GEOMETRI FOR BRUDDFIGUR ---
-# Definerer koordinater for skjærflaten (Prandtl)
-# Symmetri: Vi tegner bruddet ut til høyre hvis e >= 0, ellers venstre.
-side = 1 if e >= 0 else -1
-x_eff_start = e - (side * B_prime/2)
-x_eff_end = e + (side * B_prime/2)
-y_base = -D
-
-# Punkt 1: Indre kant av effektivt fundament
-p1 = [x_eff_start, y_base]
-
-# Punkt 2: Aktiv kile (spiss under senter av B')
-alpha1_rad = np.radians(45 + phi_d_deg/2)
-h_kile = (B_prime/2) * np.tan(alpha1_rad)
-p_apex = [e, y_base - h_kile]
-
-# Sone 2: Logaritmisk spiral
-r0 = (B_prime/2) / np.cos(alpha1_rad)
-theta_vals = np.linspace(0, np.pi/2 + np.radians(phi_d_deg), 25)
-spiral_pts = []
-for t in theta_vals:
-    r = r0 * np.exp(t * np.tan(phi_d_rad))
-    # Vinkel i forhold til horisontalen
-    angle = alpha1_rad - t
-    px = x_eff_end + (side * r * np.cos(angle))
-    py = y_base - (r * np.sin(angle))
-    spiral_pts.append([px, py])
-
-# Punkt 3: Utgang terreng (Passiv kile)
-# Vi antar at bruddet følger en rett linje fra spiralens slutt til terrengoverflaten (y=0)
-p_last_spiral = spiral_pts[-1]
-# Vinkel for passiv kile mot horisontalen: 45 - phi/2
-exit_angle = np.radians(45 - phi_d_deg/2)
-# Horisontal avstand fra spiral-slutt til terreng: x = dybde / tan(vinkel)
-dx_exit = abs(p_last_spiral[1]) * np.tan(np.radians(90) - exit_angle)
-p_exit = [p_last_spiral[0] + (side * dx_exit), 0]
-
-# Sett sammen polygon (lukket flate)
-poly_pts = [p1, p_apex] + spiral_pts + [p_exit, [x_eff_start, 0]]
+side, y_base, h_kile, p_exit, poly_pts = prandtl_geometry(phi_d_deg, B_prime, e, D)
 
 # --- FIGUR ---
+# Plotly sender figuren som vektordata til nettleseren, så en ny kjøring
+# gir en liten JSON-oppdatering i stedet for et nytt rasterbilde.
+# Figuren og elementene bygges én gang per økt (session_state, ikke
+# cache_resource, siden figuren endres på stedet) og oppdateres deretter.
+def get_fig():
+    if "fig" in st.session_state:
+        return st.session_state.fig
+
+    fig = go.Figure()
+
+    # Terreng og jordfyll: statisk, dekker hele plotbredden uansett B
+    fig.add_shape(type='rect', xref='paper', x0=0, x1=1, y0=-100, y1=0,
+                  fillcolor='#fdf2e9', line_width=0, layer='below')
+    fig.add_hline(y=0, line_color='brown', line_width=3)
+
+    # Bruddfiguren
+    fig.add_trace(go.Scatter(x=[], y=[], fill='toself', mode='lines',
+                             fillcolor='rgba(255, 165, 0, 0.3)',
+                             line=dict(color='red', dash='dash', width=1.5),
+                             name="Kritisk skjærflate", hoverinfo='skip'))
+
+    # Fundamentet
+    fig.add_shape(type='rect', name='fundament', x0=0, x1=0, y0=0, y1=0,
+                  fillcolor='grey', line_width=0)
+
+    # Lastpil
+    fig.add_annotation(name='last', x=0, y=0, ax=0, ay=2.2,
+                       xref='x', yref='y', axref='x', ayref='y', font_color='red',
+                       showarrow=True, arrowhead=2, arrowwidth=3, arrowcolor='red')
+
+    # --- Dimensjonslinjer (Presise etiketter) ---
+    dim_line = dict(mode='lines+markers', line=dict(color='black', width=1),
+                    marker=dict(symbol='line-ns-open', color='black', size=10),
+                    hoverinfo='skip')
+    fig.add_trace(go.Scatter(name='B-linje', x=[], y=[], **dim_line))
+    fig.add_annotation(name='B-tekst', showarrow=False, yanchor='top')
+    fig.add_trace(go.Scatter(name='D-linje', x=[], y=[], **dim_line))
+    fig.add_annotation(name='D-tekst', showarrow=False, xanchor='right', textangle=-90)
+
+    # Styling
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False, scaleanchor='x', scaleratio=1)
+    fig.update_layout(height=500, showlegend=False, plot_bgcolor='white',
+                      margin=dict(l=0, r=0, t=0, b=0))
+
+    st.session_state.fig = fig
+    return fig
+
+
+def update_figure(fig, B, D, e, V_k, y_base, h_kile, poly_pts):
+    fig.update_traces(selector=dict(name="Kritisk skjærflate"),
+                      x=poly_pts[:, 0], y=poly_pts[:, 1])
+    fig.update_shapes(selector=dict(name='fundament'), x0=-B/2, x1=B/2, y0=-D, y1=-D+0.4)
+    fig.update_annotations(selector=dict(name='last'), x=e, y=-D+0.4, ax=e,
+                           text=f"<b>V = {V_k:.1f} kN/m</b>")
+
+    # B-linje (Horisontal under fundament)
+    fig.update_traces(selector=dict(name='B-linje'),
+                      x=[-B/2, B/2], y=[y_base - 0.5, y_base - 0.5])
+    fig.update_annotations(selector=dict(name='B-tekst'), x=0, y=y_base - 0.7,
+                           text=f"B = {B:.1f} m")
+
+    # D-linje (Vertikal fra terreng til base)
+    # Bruker abs() og f-string for å unngå vitenskapelig notasjon ved D=0
+    fig.update_traces(selector=dict(name='D-linje'), x=[-B/2 - 0.3, -B/2 - 0.3], y=[y_base, 0])
+    fig.update_annotations(selector=dict(name='D-tekst'), x=-B/2 - 0.5,
+                           y=y_base/2 if D > 0 else -0.2, text=f"D = {D:.1f} m")
+
+    # Aksegrensene følger geometrien, siden B og D ikke har noen øvre grense.
+    # Forholdet 1:1 settes én gang i get_fig() og håndheves av nettleseren.
+    fig.update_xaxes(range=[-B*1.5, B*3.5])
+    fig.update_yaxes(range=[-D - h_kile - 3, 4])
+
+
 st.subheader("Fundamentskisse med Bruddfigur")
-fig, ax = plt.subplots(figsize=(10, 5))
-
-# Terreng og jordfyll
-ax.fill_between([-B*2, B*4], -10, 0, color='#fdf2e9', zorder=0)
-ax.axhline(0, color='brown', lw=3, zorder=5)
-
-# Tegn bruddfiguren
-failure_poly = Polygon(poly_pts, closed=True, facecolor='orange', alpha=0.3, 
-                       edgecolor='red', linestyle='--', linewidth=1.5, label="Kritisk skjærflate")
-ax.add_patch(failure_poly)
-
-# Tegn fundamentet
-rect = plt.Rectangle((-B/2, -D), B, 0.4, color='grey', alpha=1, zorder=10)
-ax.add_patch(rect)
-
-# Lastpil
-ax.annotate('', xy=(e, -D+0.4), xytext=(e, 2.0), 
-            arrowprops=dict(facecolor='red', width=3, headwidth=10))
-ax.text(e, 2.2, f"V = {V_k:.1f} kN/m", color='red', weight='bold', ha='center')
-
-# --- Dimensjonslinjer (Presise etiketter) ---
-# B-linje (Horisontal under fundament)
-ax.plot([-B/2, B/2], [y_base - 0.5, y_base - 0.5], 'k|-', lw=1)
-ax.text(0, y_base - 0.7, f"B = {B:.1f} m", ha='center', va='top')
-
-# D-linje (Vertikal fra terreng til base)
-# Bruker abs() og f-string for å unngå vitenskapelig notasjon ved D=0
-ax.plot([-B/2 - 0.3, -B/2 - 0.3], [y_base, 0], 'k|-', lw=1)
-ax.text(-B/2 - 0.5, y_base/2 if D > 0 else -0.2, f"D = {D:.1f} m", 
-        ha='right', va='center', rotation=90)
-
-# Styling
-ax.set_aspect('equal')
-ax.set_xlim(-B*1.5, B*3.5)
-ax.set_ylim(-D - h_kile - 3, 4)
-ax.axis('off')
-st.pyplot(fig)
+fig = get_fig()
+update_figure(fig, B, D, e, V_k, y_base, h_kile, poly_pts)
+st.plotly_chart(fig, width='stretch')
 
 # --- RESULTATTABELL OG FORMLER ---
 st.subheader("BELIGGENHET AV KRITISK SKJÆRFLATE:")
@@ -0,0 +1,92 @@
+"""Beregningskjerne for bæreevne av stripefundament (EC7-1 Annex D).
+
+Rene funksjoner uten Streamlit-widgets, slik at beregningene kan gjenbrukes
+og bufres uavhengig av brukergrensesnittet.
+"""
+import math
+
+import streamlit as st
+import numpy as np
+
+
+# --- BEREGNINGER ---
+@st.cache_data(max_entries=500)
+def compute_bearing(phi_k, attraksjon, gamma, gamma_m, V_k, B, D, e=0.0):
+    # 1. Dimensjonerende verdier
+    tan_phi = math.tan(math.radians(phi_k)) / gamma_m
+    phi_d_rad = math.atan(tan_phi)
+    phi_d_deg = math.degrees(phi_d_rad)
+    sin_phi = math.sin(phi_d_rad)
+
+    # 2. Effektiv bredde
+    B_prime = B - 2 * abs(e)
+
+    # 3. Bæreevnefaktorer (EC7-1 Annex D)
+    # tan²(45 + φ/2) = (1 + sin φ) / (1 - sin φ)
+    Nq = math.exp(math.pi * tan_phi) * (1 + sin_phi) / (1 - sin_phi)
+    Ngamma = 2 * (Nq - 1) * tan_phi
+
+    # 4. Kapasitet og grunntrykk
+    q_sur = gamma * D
+    sigma_d = (q_sur + attraksjon) * Nq + 0.5 * gamma * B_prime * Ngamma - attraksjon
+    q_faktisk = V_k / B_prime
+    utnyttelse = (q_faktisk / sigma_d) * 100
+
+    return phi_d_rad, phi_d_deg, B_prime, Nq, Ngamma, sigma_d, q_faktisk, utnyttelse
+
+
+# --- GEOMETRI FOR BRUDDFIGUR ---
+def prandtl_polygon(phi_d_rad, B_prime, D, e, side, n=25):
+    # Hjørnepunktene for skjærflaten (Prandtl) som en (n+4, 2)-tabell:
+    # indre kant, kilespiss, n spiralpunkter, utgang terreng, kant i terreng.
+    # Kiledybden og utgangspunktet returneres også direkte.
+    # Regnes i float64; kun tabellen til figuren gjøres om til float32, som
+    # holder i massevis for tegning og halverer datamengden.
+    pts = np.empty((n + 4, 2))
+    tan_phi = math.tan(phi_d_rad)
+    alpha1_rad = math.pi/4 + phi_d_rad/2
+    tan_alpha1 = math.tan(alpha1_rad)
+    cos_alpha1 = math.cos(alpha1_rad)
+    x_eff_start = e - (side * B_prime/2)
+    x_eff_end = e + (side * B_prime/2)
+    y_base = -D
+
+    # Punkt 1: Indre kant av effektivt fundament
+    pts[0] = x_eff_start, y_base
+
+    # Punkt 2: Aktiv kile (spiss under senter av B')
+    h_kile = (B_prime/2) * tan_alpha1
+    pts[1] = e, y_base - h_kile
+
+    # Sone 2: Logaritmisk spiral
+    r0 = (B_prime/2) / cos_alpha1
+    theta_vals = np.linspace(0, math.pi/2 + phi_d_rad, n)
+    r = r0 * np.exp(theta_vals * tan_phi)
+    # Vinkel i forhold til horisontalen
+    angle = alpha1_rad - theta_vals
+    pts[2:n + 2, 0] = x_eff_end + (side * r * np.cos(angle))
+    pts[2:n + 2, 1] = y_base - (r * np.sin(angle))
+
+    # Punkt 3: Utgang terreng (Passiv kile)
+    # Vi antar at bruddet følger en rett linje fra spiralens slutt til terrengoverflaten (y=0)
+    # Vinkel for passiv kile mot horisontalen: 45 - phi/2
+    # Horisontal avstand fra spiral-slutt til terreng: x = dybde / tan(vinkel),
+    # og 1 / tan(45 - phi/2) = tan(45 + phi/2) = tan(α₁)
+    dx_exit = abs(pts[n + 1, 1]) * tan_alpha1
+    p_exit = (pts[n + 1, 0] + (side * dx_exit), 0.0)
+    pts[n + 2] = p_exit
+
+    # Lukker flaten langs terrenget tilbake over indre kant
+    pts[n + 3] = x_eff_start, 0
+    return pts.astype(np.float32), h_kile, p_exit
+
+
+@st.cache_data(max_entries=500)
+def prandtl_geometry(phi_d_deg, B_prime, e, D):
+    # Symmetri: Vi tegner bruddet ut til høyre hvis e >= 0, ellers venstre.
+    # e = -0.0 (slider dratt tilbake fra negativ side) tegnes også til høyre.
+    side = math.copysign(1.0, e) if e else 1.0
+    y_base = -D
+    poly_pts, h_kile, p_exit = prandtl_polygon(math.radians(phi_d_deg), B_prime, D, e, side)
+
+    return side, y_base, h_kile, p_exit, poly_pts